@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP セッションの共通処理
+- requests-cache が入っていれば、レスポンスをディスク（sqlite）にキャッシュするセッションを返す
+- 入っていない / キャッシュ無効のときは普通の requests.Session
+- shared_session() は LRCLIB / PetitLyrics / UtaTen で共有し、ホストごとに接続を keep-alive で使い回す
+- HostRateLimiter はホストごとのアクセス間隔を管理する（固定の sleep の代わり）
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import requests_cache
+except ImportError:  # requests-cache が無い環境ではキャッシュなしで動かす
+    requests_cache = None
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache")
+CACHE_EXPIRE_SEC = 7 * 86400
+# 検索結果は「まだ登録されていない」ことがあるので短めに（後から歌詞が追加されたら拾えるように）
+SEARCH_EXPIRE_SEC = 3600
+_SEARCH_URL_PATTERNS = (
+    "lrclib.net/api/search",
+    "petitlyrics.com/search_lyrics",
+    "utaten.com/search",
+)
+
+BROWSER_HEADERS: Dict[str, str] = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/123.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ja,en;q=0.8",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Connection": "keep-alive",
+}
+
+
+def _is_cacheable(r: requests.Response) -> bool:
+    # cookie を発行するレスポンス（ウォームアップ用ページなど）は保存せず、毎回取りに行く
+    if "Set-Cookie" in r.headers:
+        return False
+    # 見つからなかった結果（LRCLIB の空配列など）は保存しない
+    if "json" in r.headers.get("Content-Type", "") and r.content.strip() in (b"[]", b"{}"):
+        return False
+    return True
+
+
+def new_session(
+    cache_name: Optional[str] = None,
+    use_cache: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Session:
+    """
+    セッションを作る。
+    cache_name を指定し use_cache=True なら CACHE_DIR/<cache_name>.sqlite にキャッシュする
+    （そのとき期限切れのレスポンスは削除する）。
+    """
+    if cache_name and use_cache and requests_cache is not None:
+        s: requests.Session = requests_cache.CachedSession(
+            cache_name=os.path.join(CACHE_DIR, cache_name),
+            backend="sqlite",
+            expire_after=CACHE_EXPIRE_SEC,
+            urls_expire_after={p: SEARCH_EXPIRE_SEC for p in _SEARCH_URL_PATTERNS},
+            allowable_codes=(200,),
+            cache_control=True,
+            filter_fn=_is_cacheable,
+        )
+        # requests-cache は期限切れを自動では消さないので、作るたびに掃除する
+        # （.cache は CI で毎回復元・保存するので、放っておくと肥大化し続ける）
+        try:
+            s.cache.delete(expired=True, vacuum=True)
+        except Exception as e:
+            print(f"[http_client] cache cleanup failed: {e}")
+    else:
+        s = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+
+    if headers:
+        s.headers.update(headers)
+    return s
+
+
+_shared: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """
+    共有セッション（初めて使うときに作る。import しただけでは sqlite のキャッシュを開かない）。
+    複数スレッドから同時に呼ばれても 1 つしか作らない。
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = new_session("shared", headers=BROWSER_HEADERS)
+        return _shared
+
+
+def _retry_after_sec(value: Optional[str]) -> Optional[float]:
+    """Retry-After ヘッダ（秒数 または HTTP-date）を秒数にする。読めなければ None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRateLimiter:
+    """
+    ホストごとの簡易レートリミッタ。
+    - wait(url, min_interval): 同じホストへの前回アクセスから min_interval 秒経っていなければ差分だけ待つ
+    - record(url, r): アクセスした時刻と Retry-After を記録する（キャッシュから返ったレスポンスは数えない）
+    wait はロックの中で次のアクセス時刻を予約してから眠るので、
+    同じホストに同時に wait しても min_interval ずつずれて順番に進む。
+    キャッシュから返った場合は（後から別の予約が入っていなければ）その予約を取り消す。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last: Dict[str, float] = {}
+        self._blocked_until: Dict[str, float] = {}
+        # ホスト → (最後の予約時刻, 予約前の _last)。キャッシュヒット時の取り消し用
+        self._undo: Dict[str, Tuple[float, float]] = {}
+
+    def wait(self, url: str, min_interval: float = 0.0) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            prev = self._last.get(host, 0.0)
+            ready_at = max(
+                prev + min_interval,
+                self._blocked_until.get(host, 0.0),
+                now,
+            )
+            # 枠を予約してから離す（後から来たスレッドはこの時刻を基準に待つ）
+            self._last[host] = ready_at
+            self._undo[host] = (ready_at, prev)
+        delay = ready_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, url: str, r: requests.Response) -> None:
+        host = urlsplit(url).netloc
+        if getattr(r, "from_cache", False):
+            with self._lock:
+                undo = self._undo.pop(host, None)
+                if undo and self._last.get(host) == undo[0]:
+                    self._last[host] = undo[1]
+            return
+        now = time.monotonic()
+        retry = _retry_after_sec(r.headers.get("Retry-After"))
+        with self._lock:
+            # 他のスレッドが予約した先の時刻は巻き戻さない
+            self._last[host] = max(self._last.get(host, 0.0), now)
+            if retry is not None:
+                self._blocked_until[host] = now + retry
+
+
+RATE_LIMITER = HostRateLimiter()
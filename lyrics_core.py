@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import glob
 import os
-import tempfile
+import re
+from functools import lru_cache
+from itertools import groupby
 from typing import Any, Dict, List, Tuple
 
 import yt_dlp
 
+# SRT の番号行・タイムスタンプ行（strip 済みの行に対して使う）
+_SRT_SKIP_RE = re.compile(r"\d+$|.*-->")
 
+
+@lru_cache(maxsize=1)
 def _cookie_file() -> str | None:
     """
     YT の cookie ファイルのパスを推測する。
@@ -16,6 +21,7 @@ def _cookie_file() -> str | None:
       1. 環境変数 YT_COOKIES_FILE
       2. 環境変数 YOUTUBE_COOKIES_FILE（過去互換）
       3. リポジトリルートの youtube_cookies.txt
+    結果はプロセス内でキャッシュする（環境変数を変えた場合は _cookie_file.cache_clear()）。
     """
     for key in ("YT_COOKIES_FILE", "YOUTUBE_COOKIES_FILE"):
         path = os.environ.get(key)
@@ -45,69 +51,65 @@ def _base_ydl_opts() -> Dict[str, Any]:
     return opts
 
 
-def _download_auto_sub_srt(video_id: str) -> str:
+@lru_cache(maxsize=1)
+def _subtitle_ydl() -> yt_dlp.YoutubeDL:
     """
-    yt-dlp を使って自動生成字幕を SRT 形式で一時ディレクトリに保存し、そのパスを返す。
-    ※ yt-dlp は「<id>.<lang>.srt」などで吐くことがあるので glob で拾う。
+    自動字幕取得用の YoutubeDL。
+    extractor の初期化などが重いので、1 プロセス内では同じインスタンスを使い回す。
     """
-    url = f"https://www.youtube.com/watch?v={video_id}"
+    ydl_opts = _base_ydl_opts()
+    ydl_opts.update(
+        {
+            "writeautomaticsub": True,
+            "subtitlesformat": "srt",
+        }
+    )
+    return yt_dlp.YoutubeDL(ydl_opts)
 
-    with tempfile.TemporaryDirectory(prefix="yt_sub_") as tmp_dir:
-        # outtmpl は拡張子や言語が付くことがあるので「ベース名」だけ指定
-        outtmpl = os.path.join(tmp_dir, "%(id)s")
 
-        ydl_opts = _base_ydl_opts()
-        ydl_opts.update(
-            {
-                "writeautomaticsub": True,
-                "subtitlesformat": "srt",
-                "skip_download": True,
-                "outtmpl": outtmpl,
-            }
-        )
+def _fetch_auto_sub_srt(video_id: str) -> bytes:
+    """
+    yt-dlp で動画情報だけを取得し、自動生成字幕 (SRT) の中身を直接ダウンロードして返す。
+    一時ファイルは作らない。複数言語が出たら一番大きいものを採用。
+    """
+    url = f"https://www.youtube.com/watch?v={video_id}"
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
+    ydl = _subtitle_ydl()
+    info = ydl.extract_info(url, download=False)
+    subs = (info or {}).get("requested_subtitles") or {}
 
-        # 生成された srt を拾う（複数言語が出たら一番大きいものを採用）
-        candidates = glob.glob(os.path.join(tmp_dir, "*.srt"))
-        if not candidates:
-            raise RuntimeError("SRT 字幕ファイルが生成されませんでした。")
+    bodies: List[bytes] = []
+    for sub in subs.values():
+        if sub.get("ext") != "srt":
+            continue
+        data = sub.get("data")
+        if data is None:
+            # cookie などの設定を引き継ぐため yt-dlp 側の HTTP を使う
+            with ydl.urlopen(sub["url"]) as resp:
+                data = resp.read()
+        elif isinstance(data, str):
+            data = data.encode("utf-8")
+        bodies.append(data)
 
-        best = max(candidates, key=lambda p: os.path.getsize(p))
-        # tmp_dir が消える前に内容を別ファイルへコピーして返す
-        final_path = os.path.join(tempfile.gettempdir(), f"{video_id}.auto.srt")
-        with open(best, "rb") as src, open(final_path, "wb") as dst:
-            dst.write(src.read())
+    if not bodies:
+        raise RuntimeError("SRT 字幕が取得できませんでした。")
 
-        return final_path
+    return max(bodies, key=len)
 
 
-def _srt_to_lyrics(path: str) -> str:
+def _srt_to_lyrics(data: bytes) -> str:
     """
-    SRT ファイルから歌詞テキストだけを抜き出す (タイムスタンプと番号行は削除)。
+    SRT の中身から歌詞テキストだけを抜き出す (タイムスタンプと番号行は削除)。
+    連続する同一行は 1 行にまとめる。
     """
-    lines: List[str] = []
-    with open(path, encoding="utf-8", errors="replace") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line:
-                continue
-            if line.isdigit():
-                continue
-            if "-->" in line:
-                continue
-            lines.append(line)
-
-    merged: List[str] = []
-    last: str | None = None
-    for line in lines:
-        if line == last:
-            continue
-        merged.append(line)
-        last = line
+    text = data.decode("utf-8", "replace")
 
-    return "\n".join(merged)
+    lines = [
+        line
+        for line in map(str.strip, text.split("\n"))
+        if line and not _SRT_SKIP_RE.match(line)
+    ]
+    return "\n".join(line for line, _ in groupby(lines))
 
 
 def search_lyrics_candidates(*args, **kwargs) -> List[Dict[str, Any]]:
@@ -126,8 +128,8 @@ def register_lyrics_from_request(
     必須: YouTube の動画 ID。
     自動生成字幕から歌詞を取得して (lyrics, video_id, info) を返す。
     """
-    srt_path = _download_auto_sub_srt(video_id)
-    lyrics = _srt_to_lyrics(srt_path)
+    srt = _fetch_auto_sub_srt(video_id)
+    lyrics = _srt_to_lyrics(srt)
 
     info: Dict[str, Any] = {
         "video_id": video_id,
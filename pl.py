@@ -8,13 +8,61 @@ import re
 import sys
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union
 from urllib.parse import urlencode
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+import http_client
 
 BASE = "https://petitlyrics.com"
+# 共有セッションでも送るよう、サイト固有のヘッダはリクエストごとに付ける
+_HEADERS = {"Referer": f"{BASE}/search_lyrics"}
+
+_NORM_SPACE_RE = re.compile(r"\s+")
+# 比較時に無視する記号（削除用の変換テーブル）
+_NORM_PUNCT_TABLE = str.maketrans("", "", "\"'’`“”()[]{}<>【】（）［］｛｝・/\\-–—:：,，.。!！?？~〜")
+_STOP_PAT = re.compile(r"Purchase on|Lyrics List For This Artist|Posted By:|URL of this page|このページのURL", re.I)
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+# 歌詞区間の中に混ざる UI 文言
+_SKIP_LITERALS = frozenset({"Tweet", "TOP", "Lyric Search", "歌詞検索"})
+
+_SONG_LINKS_XPATH = etree.XPath(
+    "//a[starts-with(@href, '/lyrics/') and not(contains(@href, '/artist/'))]"
+)
+# 曲リンク自身と 10 階層上までの祖先のうち、artist リンクを含む一番近い要素（行）の中の最初の artist リンク
+# （上限なしで上ると、行に artist が無いときにページヘッダなどの artist を拾ってしまう）
+_ROW_ARTIST_XPATH = etree.XPath(
+    "(ancestor-or-self::*[position() <= 11][.//a[starts-with(@href, '/lyrics/artist/')]][1]"
+    "//a[starts-with(@href, '/lyrics/artist/')])[1]"
+)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# 歌詞本文が入っていそうな要素（上から順に試す）
+_LYRICS_CONTAINER_XPATHS = tuple(
+    etree.XPath(f"(//*[{cond}])[1]")
+    for cond in (
+        "@id='lyrics'",
+        _has_class("lyrics"),
+        _has_class("lyricsBody"),
+        _has_class("lyrics-body"),
+        "@id='lyric'",
+        _has_class("lyric"),
+    )
+)
+_BOOKMARK_XPATH = etree.XPath(
+    "(//text()[re:test(., 'Bookmark this page|☆Bookmark|ブックマーク', 'i')])[1]",
+    namespaces={"re": "http://exslt.org/regular-expressions"},
+)
+# 要素の中身とそれ以降のテキストを文書順に（BeautifulSoup の next_elements 相当）
+_TEXT_FROM_XPATH = etree.XPath("descendant::text() | following::text()")
 
 
 @dataclass
@@ -28,36 +76,40 @@ class SearchHit:
 def _normalize_key(s: Optional[str]) -> str:
     if not s:
         return ""
-    s = s.strip().lower()
-    s = s.replace("　", " ")
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[\"'’`“”\(\)\[\]\{\}<>【】（）［］｛｝・/\\\-\–—:：,，\.。!！\?？~〜]", "", s)
-    return s
-
-
-def _session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Accept-Language": "ja,en;q=0.8",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Referer": f"{BASE}/search_lyrics",
-        "Connection": "keep-alive",
-    })
-    return s
+    s = s.translate(_NORM_PUNCT_TABLE)
+    return _NORM_SPACE_RE.sub("", s.lower())
+
+
+def _session(use_cache: bool = True) -> requests.Session:
+    return http_client.new_session("petitlyrics", use_cache=use_cache, headers=http_client.BROWSER_HEADERS)
 
 
 def warmup_session(s: requests.Session, sleep_sec: float = 0.2) -> None:
     try:
-        s.get(f"{BASE}/", timeout=20, allow_redirects=True)
+        s.get(f"{BASE}/", timeout=20, headers=_HEADERS, allow_redirects=True)
         time.sleep(sleep_sec)
-        s.get(f"{BASE}/search_lyrics", timeout=20, allow_redirects=True)
+        s.get(f"{BASE}/search_lyrics", timeout=20, headers=_HEADERS, allow_redirects=True)
         time.sleep(sleep_sec)
     except Exception:
         pass
 
 
+def _response_charset(r: requests.Response) -> str:
+    """
+    Content-Type の charset を返す（無ければ utf-8）。
+    r.encoding は charset が無いと ISO-8859-1 になり、lxml に任せると meta が無いページで文字化けするため。
+    """
+    m = _CHARSET_RE.search(r.headers.get("content-type", ""))
+    return m.group(1) if m else "utf-8"
+
+
+def _parse_html(html: Union[str, bytes], encoding: Optional[str]) -> etree._Element:
+    """bytes は encoding（指定があれば）でデコードしてパースする"""
+    if isinstance(html, bytes) and encoding:
+        return lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+    return lxml.html.fromstring(html)
+
+
 def build_search_url(title: str, artist: str) -> str:
     params: Dict[str, str] = {
         "title": title,
@@ -68,41 +120,35 @@ def build_search_url(title: str, artist: str) -> str:
     return f"{BASE}/search_lyrics?{urlencode(params, doseq=False)}"
 
 
-def parse_search_results(html: str) -> List[SearchHit]:
-    soup = BeautifulSoup(html, "html.parser")
-
-    # /lyrics/<数字> だけを曲ページとして拾う
-    song_links = soup.find_all("a", href=re.compile(r"^/lyrics/\d+$"))
+def parse_search_results(html: Union[str, bytes], encoding: Optional[str] = None) -> List[SearchHit]:
+    if not html:
+        return []
+    try:
+        tree = _parse_html(html, encoding)
+    except etree.ParserError:
+        return []
 
     hits: List[SearchHit] = []
     seen = set()
 
-    for a in song_links:
+    for a in _SONG_LINKS_XPATH(tree):
         href = a.get("href", "")
-        m = re.search(r"/lyrics/(\d+)$", href)
-        if not m:
+        # /lyrics/<数字> だけを曲ページとして拾う
+        lyrics_id_str = href[len("/lyrics/"):]
+        if not lyrics_id_str.isdecimal():
             continue
 
-        lyrics_id = int(m.group(1))
+        lyrics_id = int(lyrics_id_str)
         if lyrics_id in seen:
             continue
         seen.add(lyrics_id)
 
-        # 行っぽい親要素をたどって artist を取る
-        row = a
-        for _ in range(10):
-            if row is None:
-                break
-            if getattr(row, "find", None):
-                if row.find("a", href=re.compile(r"^/lyrics/artist/")):
-                    break
-            row = row.parent
+        # 曲リンクを含む一番近い「行」（10 階層上まで）の中の artist リンクを取る
+        artist_links = _ROW_ARTIST_XPATH(a)
 
-        title = a.get_text(strip=True)
+        title = a.text_content().strip()
         song_url = BASE + href
-
-        artist_a = row.find("a", href=re.compile(r"^/lyrics/artist/")) if getattr(row, "find", None) else None
-        artist = artist_a.get_text(strip=True) if artist_a else None
+        artist = artist_links[0].text_content().strip() if artist_links else None
 
         hits.append(SearchHit(
             lyrics_id=lyrics_id,
@@ -133,81 +179,97 @@ def choose_best_hit(hits: List[SearchHit], req_title: str, req_artist: str) -> O
     return max(cand, key=lambda x: x.lyrics_id)
 
 
-def extract_lyrics_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+def _joined_text(el) -> str:
+    """BeautifulSoup の get_text("\\n", strip=True) 相当"""
+    return "\n".join(t for t in (x.strip() for x in el.itertext()) if t)
+
+
+def extract_lyrics_text(html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    if not html:
+        return ""
+    try:
+        root = _parse_html(html, encoding)
+    except etree.ParserError:
+        return ""
 
-    for t in soup(["script", "style", "noscript"]):
-        t.decompose()
+    etree.strip_elements(root, "script", "style", "noscript", with_tail=False)
 
     # よくある候補
-    for sel in ("#lyrics", ".lyrics", ".lyricsBody", ".lyrics-body", "#lyric", ".lyric"):
-        el = soup.select_one(sel)
-        if el:
-            txt = el.get_text("\n", strip=True)
+    for xp in _LYRICS_CONTAINER_XPATHS:
+        found = xp(root)
+        if found:
+            txt = _joined_text(found[0])
             if len(txt) > 30:
                 return txt
 
     # それっぽい区間抽出（Bookmark〜Posted By）
-    start = soup.find(string=re.compile(r"Bookmark this page|☆Bookmark|ブックマーク", re.I))
-    if start:
+    found = _BOOKMARK_XPATH(root)
+    if found:
+        start = found[0]
+        parent = start.getparent()
+        if start.is_tail:
+            parent = parent.getparent()
+
         chunks: List[str] = []
-        stop_pat = re.compile(r"Purchase on|Lyrics List For This Artist|Posted By:|URL of this page|このページのURL", re.I)
-
-        for node in start.parent.next_elements:
-            if isinstance(node, str):
-                t = node.strip()
-                if not t:
-                    continue
-                if stop_pat.search(t):
-                    break
-                if t in ("Tweet", "TOP", "Lyric Search", "歌詞検索"):
-                    continue
-                chunks.append(t)
+        for node in _TEXT_FROM_XPATH(parent):
+            t = node.strip()
+            if not t:
+                continue
+            if _STOP_PAT.search(t):
+                break
+            if t in _SKIP_LITERALS:
+                continue
+            chunks.append(t)
 
         text = "\n".join(chunks).strip()
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = _MULTI_NL_RE.sub("\n\n", text)
         if len(text) > 30:
             return text
 
-    return soup.get_text("\n", strip=True)
+    return _joined_text(root)
 
 
 def fetch_lyrics_only(s: requests.Session, lyrics_id: int, sleep_sec: float = 1.0) -> str:
     url = f"{BASE}/lyrics/{lyrics_id}"
-    r = s.get(url, timeout=20, allow_redirects=True)
+    r = s.get(url, timeout=20, headers=_HEADERS, allow_redirects=True)
 
     if "petitlyrics.com/404.php" in r.url:
         raise RuntimeError(f"歌詞ページが 404.php に飛びました: {url} -> {r.url}")
 
     r.raise_for_status()
-    r.encoding = r.apparent_encoding or "utf-8"
 
     time.sleep(sleep_sec)
-    return extract_lyrics_text(r.text)
+    return extract_lyrics_text(r.content, _response_charset(r))
 
 
 # ---------- 外部から呼び出す用の関数 ----------
 
-def fetch_petitlyrics(title: str, artist: str, sleep_sec: float = 1.0) -> Tuple[str, Dict[str, Optional[str]]]:
+def fetch_petitlyrics(
+    title: str,
+    artist: str,
+    sleep_sec: float = 1.0,
+    use_cache: bool = True,
+    session: Optional[requests.Session] = None,
+) -> Tuple[str, Dict[str, Optional[str]]]:
     """
     指定したタイトル / アーティストで PetitLyrics を検索し、
     歌詞本文とメタ情報を返す。
     戻り値: (lyrics, meta)
     meta には lyrics_id, title, artist, song_url, search_url が入る。
+    session を渡した場合はそれを使う（複数サイトで共有する接続など）。
     """
-    s = _session()
+    s = session if session is not None else _session(use_cache)
     warmup_session(s, sleep_sec=min(0.3, sleep_sec))
 
     search_url = build_search_url(title, artist)
-    r = s.get(search_url, timeout=20, allow_redirects=True)
+    r = s.get(search_url, timeout=20, headers=_HEADERS, allow_redirects=True)
 
     if "petitlyrics.com/404.php" in r.url:
         raise RuntimeError(f"検索が 404.php に飛びました: {search_url} -> {r.url}")
 
     r.raise_for_status()
-    r.encoding = r.apparent_encoding or "utf-8"
 
-    hits = parse_search_results(r.text)
+    hits = parse_search_results(r.content, _response_charset(r))
     best = choose_best_hit(hits, title, artist)
     if not best:
         raise RuntimeError("一致する曲が見つかりませんでした。")
@@ -237,11 +299,14 @@ def main():
     ap.add_argument("--title", required=True, help="曲名")
     ap.add_argument("--artist", required=True, help="アーティスト名")
     ap.add_argument("--sleep", type=float, default=1.0, help="アクセス間隔(秒)")
+    ap.add_argument("--no-cache", action="store_true", help="HTTP キャッシュを使わない")
     ap.add_argument("--lyrics-only", action="store_true", help="歌詞本文だけ出力")
     args = ap.parse_args()
 
     try:
-        lyrics, meta = fetch_petitlyrics(args.title, args.artist, sleep_sec=args.sleep)
+        lyrics, meta = fetch_petitlyrics(
+            args.title, args.artist, sleep_sec=args.sleep, use_cache=not args.no_cache
+        )
     except RuntimeError as e:
         raise SystemExit(str(e))
 
@@ -1,22 +1,48 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from __future__ import annotations
+
+import asyncio
+import importlib
+import io
 import json
 import os
 import re
 import sys
+import unicodedata
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
 
-import requests
-from github import Github, Auth
+try:
+    import orjson
+except ImportError:  # orjson が無い環境では標準の json を使う
+    orjson = None
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR))  # ルート直下のモジュールを import できるように
 
-import lyrics_core   # YouTube 自動字幕
-import pl            # PetitLyrics
-import uta           # UtaTen
+
+def _lazy(module: str, attr: str) -> Callable[..., Any]:
+    """module.attr を、最初に呼ばれたときに import して呼ぶ関数を返す"""
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module), attr)(*args, **kwargs)
+    return call
+
+
+# 歌詞ソース（bs4 / lxml / yt-dlp を読み込むので重い）は、実際に問い合わせるときに import する
+_register_youtube_lyrics = _lazy("lyrics_core", "register_lyrics_from_request")  # YouTube 自動字幕
+_fetch_petitlyrics = _lazy("pl", "fetch_petitlyrics")                          # PetitLyrics
+_fetch_utaten = _lazy("uta", "fetch_utaten")                                   # UtaTen
+
+
+def _shared_session() -> requests.Session:
+    """共有 HTTP セッションを返す（http_client と requests / requests-cache はここで初めて import する）"""
+    return importlib.import_module("http_client").shared_session()
 
 
 # ---------- GitHub イベント読み込み ----------
@@ -25,27 +51,28 @@ def load_github_event() -> Dict[str, Any]:
     path = os.environ.get("GITHUB_EVENT_PATH")
     if not path:
         raise RuntimeError("環境変数 GITHUB_EVENT_PATH が設定されていません。")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 # ---------- Issue 本文パース（パターンA） ----------
 
-YOUTUBE_PATTERNS = [
-    r"(?:https?://)?(?:www\.)?youtu\.be/([0-9A-Za-z_-]{8,})",
-    r"(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([0-9A-Za-z_-]{8,})",
-    r"(?:https?://)?(?:www\.)?youtube\.com/shorts/([0-9A-Za-z_-]{8,})",
-]
+# youtu.be/<id> / youtube.com/watch?v=<id> / youtube.com/shorts/<id> を 1 本の正規表現で
+_YT_RE = re.compile(
+    r"(?:https?://)?(?:www\.)?(?:youtu\.be/|youtube\.com/(?:watch\?v=|shorts/))([0-9A-Za-z_-]{8,})",
+    re.ASCII,
+)
+
+# "アーティスト - タイトル" の区切り（半角スペースで囲んだ半角ハイフン）
+ARTIST_TITLE_SEP = " - "
 
 
 def extract_video_id_from_text(text: str) -> Optional[str]:
-    for pat in YOUTUBE_PATTERNS:
-        m = re.search(pat, text or "")
-        if m:
-            vid = (m.group(1) or "").strip()
-            if vid:
-                return vid
-    return None
+    m = _YT_RE.search(text or "")
+    return m.group(1) if m else None
 
 
 def parse_issue_body(body: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
@@ -59,16 +86,12 @@ def parse_issue_body(body: str) -> Tuple[Optional[str], Optional[str], Optional[
     artist: Optional[str] = None
     title: Optional[str] = None
 
-    lines = [line.strip() for line in (body or "").splitlines()]
-
-    for line in lines:
-        if not line:
-            continue
-        if " - " in line:
-            left, right = line.split(" - ", 1)
-            artist = (left or "").strip() or None
-            title = (right or "").strip() or None
-            break
+    # 最初の空でない行だけを見る（説明文や URL の行を誤って拾わない）
+    first = next((line.strip() for line in (body or "").splitlines() if line.strip()), "")
+    if ARTIST_TITLE_SEP in first:
+        left, right = first.split(ARTIST_TITLE_SEP, 1)
+        artist = left.strip() or None
+        title = right.strip() or None
 
     video_id = extract_video_id_from_text(body or "")
     return artist, title, video_id
@@ -78,19 +101,31 @@ def parse_issue_body(body: str) -> Tuple[Optional[str], Optional[str], Optional[
 
 LRC_LIB_BASE = "https://lrclib.net"
 
+_WS_RE = re.compile(r"\s+")
 
+# LRCLIB 向けのヘッダ（セッションは http_client.shared_session() を共有する）
+_LRCLIB_HEADERS = {
+    "User-Agent": "LyricsGet (https://github.com/LRCHub/LyricsGet)",
+    "Accept": "application/json",
+}
+
+
+@lru_cache(maxsize=2048)
 def _nf_lrc(s: str) -> str:
-    import unicodedata as u
-    t = u.normalize("NFKC", s or "")
-    return re.sub(r"\s+", " ", t).strip().lower()
+    t = unicodedata.normalize("NFKC", s or "")
+    return _WS_RE.sub(" ", t).strip().lower()
 
 
 def search_lrclib_by_artist_title(
     artist: Optional[str],
     title: Optional[str],
+    session: Optional[requests.Session] = None,
 ) -> Optional[Dict[str, Any]]:
     """
-    LRCLIB /api/search を叩いて最も良さそうな1件を返す。
+    LRCLIB から最も良さそうな1件を返す（/api/search 1 回だけ）。
+    候補の中に artist / title が完全一致（正規化後）するものがあればそれを、
+    無ければ候補をスコアリングして選ぶ。
+    session を省略すると共有セッションを使う。
     """
     if not artist and not title:
         return None
@@ -104,8 +139,11 @@ def search_lrclib_by_artist_title(
     if not params:
         return None
 
+    if session is None:
+        session = _shared_session()
+
     try:
-        r = requests.get(f"{LRC_LIB_BASE}/api/search", params=params, timeout=20)
+        r = session.get(f"{LRC_LIB_BASE}/api/search", params=params, headers=_LRCLIB_HEADERS, timeout=20)
         r.raise_for_status()
         data = r.json()
     except Exception as e:
@@ -115,12 +153,27 @@ def search_lrclib_by_artist_title(
     if not isinstance(data, list) or not data:
         return None
 
+    # 入力側の正規化はレコードごとに変わらないので先に一度だけ計算する
+    nt = _nf_lrc(title) if title else ""
+    na = _nf_lrc(artist) if artist else ""
+    nt_len = len(nt)
+    na_len = len(na)
+
+    # /api/get 相当の完全一致（search の結果はレコード全体を含むので、ここで選べば 2 回目の問い合わせは要らない）
+    if artist and title:
+        for rec in data:
+            if (
+                _nf_lrc(str(rec.get("trackName") or "")) == nt
+                and _nf_lrc(str(rec.get("artistName") or "")) == na
+            ):
+                return rec
+
     def score(rec: Dict[str, Any]) -> int:
         s = 0
         if title and rec.get("trackName"):
-            s += 2 * (100 - abs(len(_nf_lrc(title)) - len(_nf_lrc(str(rec["trackName"])))))
+            s += 2 * (100 - abs(nt_len - len(_nf_lrc(str(rec["trackName"])))))
         if artist and rec.get("artistName"):
-            s += 2 * (100 - abs(len(_nf_lrc(artist)) - len(_nf_lrc(str(rec["artistName"])))))
+            s += 2 * (100 - abs(na_len - len(_nf_lrc(str(rec["artistName"])))))
         return s
 
     return max(data, key=score)
@@ -140,6 +193,13 @@ JSON_START = "<!-- LYRICS_API_JSON_START -->"
 JSON_END = "<!-- LYRICS_API_JSON_END -->"
 
 
+def _dump_payload(payload: Dict[str, Any]) -> str:
+    """ペイロードを 2 スペースインデントの JSON にする（非 ASCII はそのまま）"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
 def _looks_like_lyrics(text: str) -> bool:
     t = (text or "").strip()
     if not t:
@@ -152,6 +212,42 @@ def _looks_like_lyrics(text: str) -> bool:
     return True
 
 
+def _meta_detail_items(meta: Optional[Dict[str, Any]], url_key: str) -> List[str]:
+    """歌詞サイトのメタ情報から「取得詳細」の項目を作る"""
+    if not meta:
+        return []
+    detail = []
+    if meta.get("title"):
+        detail.append(f"title='{meta['title']}'")
+    if meta.get("artist"):
+        detail.append(f"artist='{meta['artist']}'")
+    if meta.get(url_key):
+        detail.append(f"url={meta[url_key]}")
+    return detail
+
+
+def _render_source_block(
+    w: Callable[[str], Any],
+    status: str,
+    source_label: str,
+    detail_items: List[str],
+    blocks: List[Tuple[str, str, str]],
+    detail_label: str = "取得詳細",
+) -> None:
+    """
+    取得元ごとの共通部分（ステータス / 取得元 / 詳細 / 歌詞のコードブロック）を w で書き出す。
+    blocks は (見出し, コードブロックの言語, 本文) のリスト。
+    """
+    w(f"- ステータス: {status}\n")
+    w(f"- 取得元: {source_label}\n")
+    if detail_items:
+        w(f"- {detail_label}: {', '.join(detail_items)}\n")
+    for heading, fence, text in blocks:
+        w(f"\n#### {heading}\n```{fence}\n")
+        w(text)  # 歌詞本文は大きいので連結せずにそのまま書く
+        w("\n```\n")
+
+
 def build_comment_body(
     artist: Optional[str],
     title: Optional[str],
@@ -165,31 +261,34 @@ def build_comment_body(
     utaten_lyrics: Optional[str],
     utaten_meta: Optional[Dict[str, Any]],
 ) -> str:
-    lines: list[str] = []
+    buf = io.StringIO()
+    w = buf.write
 
-    lines.append("自動歌詞検索の結果をお知らせします 🤖\n")
+    w("自動歌詞検索の結果をお知らせします 🤖\n\n")
 
     # 解析結果
-    lines.append("### 解析結果")
-    lines.append(f"- アーティスト: **{artist}**" if artist else "- アーティスト: (未入力)")
-    lines.append(f"- 楽曲名: **{title}**" if title else "- 楽曲名: (未入力)")
-    lines.append(f"- 動画 ID: `{video_id}`" if video_id else "- 動画 ID: (未指定)")
+    w("### 解析結果\n")
+    w(f"- アーティスト: **{artist}**\n" if artist else "- アーティスト: (未入力)\n")
+    w(f"- 楽曲名: **{title}**\n" if title else "- 楽曲名: (未入力)\n")
+    w(f"- 動画 ID: `{video_id}`\n" if video_id else "- 動画 ID: (未指定)\n")
 
-    lines.append("\n### 歌詞検索結果")
+    w("\n### 歌詞検索結果\n")
 
     if chosen_source == "youtube" and youtube_lyrics:
-        lines.append("- ステータス: 自動登録（YouTube 自動字幕）")
-        lines.append("- 取得元: YouTube（自動字幕）")
-        if youtube_info and youtube_info.get("url"):
-            lines.append(f"- 参照: {youtube_info['url']}")
-        lines.append("\n#### 歌詞（テキスト）")
-        lines.append("```text")
-        lines.append(youtube_lyrics.strip())
-        lines.append("```")
+        _render_source_block(
+            w,
+            "自動登録（YouTube 自動字幕）",
+            "YouTube（自動字幕）",
+            [youtube_info["url"]] if youtube_info and youtube_info.get("url") else [],
+            [("歌詞（テキスト）", "text", youtube_lyrics.strip())],
+            detail_label="参照",
+        )
 
     elif chosen_source == "lrclib" and lrclib_rec:
         plain = (lrclib_rec.get("plainLyrics") or "").strip()
         synced = (lrclib_rec.get("syncedLyrics") or "").strip()
+        tn = (lrclib_rec.get("trackName") or lrclib_rec.get("name") or "").strip()
+        an = (lrclib_rec.get("artistName") or "").strip()
 
         if synced:
             status = "自動登録（同期あり）"
@@ -198,75 +297,43 @@ def build_comment_body(
         else:
             status = "歌詞の登録なし"
 
-        lines.append(f"- ステータス: {status}")
-        lines.append("- 取得元: 外部歌詞データベース")
-
-        tn = (lrclib_rec.get("trackName") or lrclib_rec.get("name") or "").strip()
-        an = (lrclib_rec.get("artistName") or "").strip()
         detail = []
         if tn:
             detail.append(f"track='{tn}'")
         if an:
             detail.append(f"artist='{an}'")
-        if detail:
-            lines.append(f"- 取得詳細: {', '.join(detail)}")
 
+        blocks = []
         if synced:
-            lines.append("\n#### syncedLyrics（タイミング付き）")
-            lines.append("```lrc")
-            lines.append(synced)
-            lines.append("```")
-
+            blocks.append(("syncedLyrics（タイミング付き）", "lrc", synced))
         if plain:
-            lines.append("\n#### plainLyrics（テキストのみ）")
-            lines.append("```text")
-            lines.append(plain)
-            lines.append("```")
+            blocks.append(("plainLyrics（テキストのみ）", "text", plain))
 
-        if (not synced) and (not plain):
-            lines.append("- 歌詞が空でした。")
+        _render_source_block(w, status, "外部歌詞データベース", detail, blocks)
+        if not blocks:
+            w("- 歌詞が空でした。\n")
 
     elif chosen_source == "petitlyrics" and petit_lyrics:
-        lines.append("- ステータス: 自動登録（テキストのみ）")
-        lines.append("- 取得元: 歌詞サイト（その1）")
-        if petit_meta:
-            detail = []
-            if petit_meta.get("title"):
-                detail.append(f"title='{petit_meta['title']}'")
-            if petit_meta.get("artist"):
-                detail.append(f"artist='{petit_meta['artist']}'")
-            if petit_meta.get("song_url"):
-                detail.append(f"url={petit_meta['song_url']}")
-            if detail:
-                lines.append(f"- 取得詳細: {', '.join(detail)}")
-
-        lines.append("\n#### 歌詞（テキスト）")
-        lines.append("```text")
-        lines.append(petit_lyrics.strip())
-        lines.append("```")
+        _render_source_block(
+            w,
+            "自動登録（テキストのみ）",
+            "歌詞サイト（その1）",
+            _meta_detail_items(petit_meta, "song_url"),
+            [("歌詞（テキスト）", "text", petit_lyrics.strip())],
+        )
 
     elif chosen_source == "utaten" and utaten_lyrics:
-        lines.append("- ステータス: 自動登録（テキストのみ）")
-        lines.append("- 取得元: 歌詞サイト（その2）")
-        if utaten_meta:
-            detail = []
-            if utaten_meta.get("title"):
-                detail.append(f"title='{utaten_meta['title']}'")
-            if utaten_meta.get("artist"):
-                detail.append(f"artist='{utaten_meta['artist']}'")
-            if utaten_meta.get("url"):
-                detail.append(f"url={utaten_meta['url']}")
-            if detail:
-                lines.append(f"- 取得詳細: {', '.join(detail)}")
-
-        lines.append("\n#### 歌詞（テキスト）")
-        lines.append("```text")
-        lines.append(utaten_lyrics.strip())
-        lines.append("```")
+        _render_source_block(
+            w,
+            "自動登録（テキストのみ）",
+            "歌詞サイト（その2）",
+            _meta_detail_items(utaten_meta, "url"),
+            [("歌詞（テキスト）", "text", utaten_lyrics.strip())],
+        )
 
     else:
-        lines.append("- ステータス: 歌詞の取得に失敗しました")
-        lines.append("- 取得元: YouTube → 外部DB → 歌詞サイト（複数）いずれも取得不可")
+        w("- ステータス: 歌詞の取得に失敗しました\n")
+        w("- 取得元: YouTube → 外部DB → 歌詞サイト（複数）いずれも取得不可\n")
 
     # 機械用ペイロード
     payload: Dict[str, Any] = {
@@ -291,16 +358,14 @@ def build_comment_body(
         },
     }
 
-    lines.append("\n---")
-    lines.append("以下はローカルスクリプト用のペイロードです（編集しないでください）。")
-    lines.append(JSON_START)
-    lines.append("```json")
-    lines.append(json.dumps(payload, ensure_ascii=False, indent=2))
-    lines.append("```")
-    lines.append(JSON_END)
+    w("\n---\n")
+    w("以下はローカルスクリプト用のペイロードです（編集しないでください）。\n")
+    w(f"{JSON_START}\n```json\n")
+    w(_dump_payload(payload))
+    w(f"\n```\n{JSON_END}\n")
 
-    lines.append("\n※ このコメントは GitHub Actions の自動処理で追加されています。")
-    return "\n".join(lines)
+    w("\n※ このコメントは GitHub Actions の自動処理で追加されています。")
+    return buf.getvalue()
 
 
 def comment_to_issue(repo, issue_number: int, body: str) -> None:
@@ -308,6 +373,102 @@ def comment_to_issue(repo, issue_number: int, body: str) -> None:
     issue.create_comment(body)
 
 
+# ---------- 各ソースの並列取得 ----------
+
+def fetch_youtube_lyrics(
+    artist: Optional[str],
+    title: Optional[str],
+    video_id: str,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    YouTube 自動字幕から歌詞を取得する。
+    歌詞として使えない / 失敗した場合は (None, None) を返す。
+    """
+    try:
+        y_lyrics, _y_vid, y_info = _register_youtube_lyrics(
+            artist or "",
+            title or "",
+            video_id,
+        )
+    except Exception as e:
+        print(f"[youtube] error: {e}")
+        return None, None
+
+    if not _looks_like_lyrics(y_lyrics):
+        print("[youtube] lyrics empty/too short")
+        return None, None
+
+    print("[youtube] lyrics ok")
+    return y_lyrics, y_info
+
+
+def fetch_site_lyrics(
+    label: str,
+    fetch: Callable[..., Tuple[str, Dict[str, Optional[str]]]],
+    artist: Optional[str],
+    title: Optional[str],
+    session: Optional[requests.Session] = None,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    歌詞サイト（pl.fetch_petitlyrics / uta.fetch_utaten）から歌詞を取得する。
+    失敗した場合は (None, None) を返す。
+    """
+    if not (artist or title):
+        print(f"[{label}] skipped (artist/title が空)")
+        return None, None
+
+    try:
+        lyrics, meta = fetch(title or "", artist or "", sleep_sec=1.0, session=session or _shared_session())
+    except Exception as e:
+        print(f"[{label}] error: {e}")
+        return None, None
+
+    if _looks_like_lyrics(lyrics):
+        print(f"[{label}] lyrics ok:", meta)
+    else:
+        print(f"[{label}] lyrics empty/too short")
+    return lyrics, meta
+
+
+async def lookup_all_sources(
+    artist: Optional[str],
+    title: Optional[str],
+    video_id: Optional[str],
+    session: Optional[requests.Session] = None,
+) -> Tuple[
+    Tuple[Optional[str], Optional[Dict[str, Any]]],
+    Optional[Dict[str, Any]],
+    Tuple[Optional[str], Optional[Dict[str, Any]]],
+    Tuple[Optional[str], Optional[Dict[str, Any]]],
+]:
+    """
+    YouTube 自動字幕 / LRCLIB / PetitLyrics / UtaTen に同時に問い合わせる。
+    どれもブロッキング処理なのでスレッドで回し、待ち時間を「和」ではなく「最大値」にする。
+    session は LRCLIB / PetitLyrics / UtaTen で共有する（省略時は http_client の共有セッション）。
+    戻り値: ((youtube_lyrics, youtube_info), lrclib_rec, (petit_lyrics, petit_meta), (utaten_lyrics, utaten_meta))
+    """
+    async def no_video() -> Tuple[None, None]:
+        return None, None
+
+    results = await asyncio.gather(
+        asyncio.to_thread(fetch_youtube_lyrics, artist, title, video_id) if video_id else no_video(),
+        asyncio.to_thread(search_lrclib_by_artist_title, artist, title, session),
+        asyncio.to_thread(fetch_site_lyrics, "petitlyrics", _fetch_petitlyrics, artist, title, session),
+        asyncio.to_thread(fetch_site_lyrics, "utaten", _fetch_utaten, artist, title, session),
+        return_exceptions=True,
+    )
+
+    labels = ("youtube", "lrclib", "petitlyrics", "utaten")
+    empties = ((None, None), None, (None, None), (None, None))
+    out = []
+    for label, empty, res in zip(labels, empties, results):
+        if isinstance(res, BaseException):
+            print(f"[{label}] error: {res}")
+            res = empty
+        out.append(res)
+    return out[0], out[1], out[2], out[3]
+
+
 # ---------- メイン ----------
 
 def main() -> None:
@@ -319,9 +480,6 @@ def main() -> None:
     if not repo_name:
         raise RuntimeError("環境変数 GITHUB_REPOSITORY が設定されていません。")
 
-    gh = Github(auth=Auth.Token(token))
-    repo = gh.get_repo(repo_name)
-
     event = load_github_event()
     action = event.get("action")
     issue_data = event.get("issue")
@@ -339,85 +497,53 @@ def main() -> None:
         print("対象外アクションなのでスキップします。")
         return
 
+    # 処理対象のイベントと分かってから PyGithub を読み込む
+    from github import Github, Auth
+
+    gh = Github(auth=Auth.Token(token))
+    repo = gh.get_repo(repo_name)
+
     artist, title, video_id = parse_issue_body(issue_body)
     print(f"parsed: artist={artist}, title={title}, video_id={video_id}")
 
     chosen_source = "none"
-    youtube_lyrics: Optional[str] = None
-    youtube_info: Optional[Dict[str, Any]] = None
-    lrclib_rec: Optional[Dict[str, Any]] = None
-    petit_lyrics: Optional[str] = None
-    petit_meta: Optional[Dict[str, Any]] = None
-    utaten_lyrics: Optional[str] = None
-    utaten_meta: Optional[Dict[str, Any]] = None
-
-    # 1) YouTube（動画IDがある場合のみ）
-    if video_id:
-        try:
-            y_lyrics, y_vid, y_info = lyrics_core.register_lyrics_from_request(
-                artist or "",
-                title or "",
-                video_id,
-            )
-            if _looks_like_lyrics(y_lyrics):
-                chosen_source = "youtube"
-                youtube_lyrics = y_lyrics
-                youtube_info = y_info
-                print("[youtube] lyrics ok")
-            else:
-                print("[youtube] lyrics empty/too short -> fallback to LRCLIB")
-        except Exception as e:
-            print(f"[youtube] error: {e} -> fallback to LRCLIB")
-
-    # 2) LRCLIB（YouTube が成功しなかった時）
-    if chosen_source != "youtube":
-        lrclib_rec = search_lrclib_by_artist_title(artist, title)
-        if _lrclib_has_lyrics(lrclib_rec):
-            chosen_source = "lrclib"
-            print("[lrclib] record with lyrics found:", lrclib_rec.get("id"), lrclib_rec.get("trackName"), lrclib_rec.get("artistName"))
-        else:
-            if lrclib_rec:
-                print("[lrclib] record found but lyrics empty")
-            else:
-                print("[lrclib] no record found")
-
-    # 3) PetitLyrics（YouTube & LRCLIB どちらもダメなとき）
-    if chosen_source not in {"youtube", "lrclib"}:
-        if artist or title:
-            try:
-                petit_lyrics, petit_meta = pl.fetch_petitlyrics(
-                    title or "",
-                    artist or "",
-                    sleep_sec=1.0,
-                )
-                if _looks_like_lyrics(petit_lyrics):
-                    chosen_source = "petitlyrics"
-                    print("[petitlyrics] lyrics ok:", petit_meta)
-                else:
-                    print("[petitlyrics] lyrics empty/too short -> try UtaTen")
-            except Exception as e:
-                print(f"[petitlyrics] error: {e} -> try UtaTen")
-        else:
-            print("[petitlyrics] skipped (artist/title が空)")
-
-    # 4) UtaTen（YouTube & LRCLIB & プチリリ すべてダメなとき）
-    if chosen_source not in {"youtube", "lrclib", "petitlyrics"}:
-        if artist or title:
-            try:
-                utaten_lyrics, utaten_meta = uta.fetch_utaten(
-                    title or "",
-                    artist or "",
-                    sleep_sec=1.0,
-                )
-                if _looks_like_lyrics(utaten_lyrics):
-                    chosen_source = "utaten"
-                    print("[utaten] lyrics ok:", utaten_meta)
-                else:
-                    print("[utaten] lyrics empty/too short")
-            except Exception as e:
-                print(f"[utaten] error: {e}")
+
+    # 共有セッションはスレッドに渡す前にここで 1 つだけ作る（期限切れキャッシュの掃除もここで 1 回）
+    session = _shared_session()
+
+    # 全ソースに並列で問い合わせ、優先順位
+    #   1) YouTube（動画IDがある場合のみ） 2) LRCLIB 3) PetitLyrics 4) UtaTen
+    # で最初に歌詞が取れたものを採用する
+    (
+        (youtube_lyrics, youtube_info),
+        lrclib_rec,
+        (petit_lyrics, petit_meta),
+        (utaten_lyrics, utaten_meta),
+    ) = asyncio.run(lookup_all_sources(artist, title, video_id, session))
+
+    if youtube_lyrics:
+        chosen_source = "youtube"
+    elif _lrclib_has_lyrics(lrclib_rec):
+        chosen_source = "lrclib"
+        print("[lrclib] record with lyrics found:", lrclib_rec.get("id"), lrclib_rec.get("trackName"), lrclib_rec.get("artistName"))
+    else:
+        if lrclib_rec:
+            print("[lrclib] record found but lyrics empty")
         else:
-            print("[utaten] skipped (artist/title が空)")
+            print("[lrclib] no record found")
+
+        if _looks_like_lyrics(petit_lyrics):
+            chosen_source = "petitlyrics"
+        elif _looks_like_lyrics(utaten_lyrics):
+            chosen_source = "utaten"
+
+    # 順番にフォールバックしていた頃と同じく、採用したソースより後ろの結果はコメントに載せない
+    if chosen_source == "youtube":
+        lrclib_rec = None
+    if chosen_source in {"youtube", "lrclib"}:
+        petit_lyrics, petit_meta = None, None
+    if chosen_source in {"youtube", "lrclib", "petitlyrics"}:
+        utaten_lyrics, utaten_meta = None, None
 
     comment_body = build_comment_body(
         artist=artist,
@@ -14,18 +14,27 @@ UtaTen (utaten.com)
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import re
 import sys
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Tuple
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Iterable, List, Optional, Dict, Pattern, Tuple
 from urllib.parse import urlencode
 
 import requests
-from bs4 import BeautifulSoup
-from bs4.element import Tag, NavigableString
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import NavigableString, PageElement, Tag
+
+import http_client
 
 BASE = "https://utaten.com"
+_ENCODING = "utf-8"  # utaten.com のページはすべて UTF-8
+# 共有セッションでも送るよう、サイト固有のヘッダはリクエストごとに付ける
+_HEADERS = {"Referer": f"{BASE}/search"}
 
 
 @dataclass
@@ -40,6 +49,30 @@ _RE_KANJI = re.compile(r"[\u4E00-\u9FFF]")
 _RE_JP = re.compile(r"[\u3040-\u30FF\u4E00-\u9FFF]")
 _RE_LATIN_SEQ = re.compile(r"[A-Za-z]{2,}")  # \b だと和文との境界で拾えないのでこれを使う
 _RE_LATIN_ONLY = re.compile(r"^[A-Za-z]+$")
+_RE_KANA_ONLY = re.compile(r"^[\u3040-\u30FFー゛゜]+$")
+_RE_WS = re.compile(r"\s+")
+_RE_MULTI_NL = re.compile(r"\n{3,}")
+_RE_NORM_PUNCT = re.compile(r"[\"'’`“”\(\)\[\]\{\}<>【】（）［］｛｝・/\\\-\–—:：,，\.。!！\?？~〜]")
+
+# 検索結果のリンク
+_RE_LYRIC_HREF = re.compile(r"^/lyric/[^/]+/")
+_RE_ARTIST_HREF = re.compile(r"^/artist/\d+/")
+
+# 歌詞ページ: 歌詞の直前にある UI 文言 / 歌詞の後ろに来る文言 / 歌詞に混ざる UI 文言
+_RE_DARK_MODE = re.compile(r"ダークモード")
+_RE_FURIGANA = re.compile(r"ふりがな")
+_RE_STOP = re.compile(
+    r"(この歌詞へのご意見|みんなのレビュー|レビューを投稿|ブログやHPでこの歌詞を共有|UtaTenはreCAPTCHA|歌詞検索UtaTen)",
+    re.I
+)
+# 歌詞本文のコンテナ
+_LYRIC_CONTAINER_CLASS = "hiragana"
+_LYRIC_STRAINER = SoupStrainer(attrs={"class": ["hiragana", "lyricBox"]})
+_JUNK_EXACT = frozenset({
+    "文字サイズ", "ふりがな", "ダークモード",
+    "歌詞検索", "マイページ",
+    "歌詞",
+})
 
 
 def has_kanji(s: str) -> bool:
@@ -51,63 +84,115 @@ def has_japanese(s: str) -> bool:
 
 
 def is_kana_only(s: str) -> bool:
-    if not s:
-        return False
-    for ch in s:
-        if ("\u3040" <= ch <= "\u30FF") or ch in "ー゛゜":
-            continue
-        return False
-    return True
+    return bool(_RE_KANA_ONLY.match(s))
 
 
+@lru_cache(maxsize=2048)
 def _normalize_key(s: Optional[str]) -> str:
     if not s:
         return ""
     s = s.strip().lower().replace("　", " ")
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[\"'’`“”\(\)\[\]\{\}<>【】（）［］｛｝・/\\\-\–—:：,，\.。!！\?？~〜]", "", s)
+    s = _RE_WS.sub("", s)
+    s = _RE_NORM_PUNCT.sub("", s)
     return s
 
 
 def latin_heavy(line: str) -> bool:
     """ローマ字ブロック判定：英字の塊が多い行に入ったらそこで止める"""
-    chunks = _RE_LATIN_SEQ.findall(line)
-    total = sum(len(c) for c in chunks)
     # 普通の歌詞で英字が少し出る程度なら切らないように、少し強めの閾値
-    return (total >= 12 and len(chunks) >= 4)
+    # （英字 12 文字以上・4 塊以上。条件を満たした時点で打ち切る）
+    total = 0
+    chunks = 0
+    for m in _RE_LATIN_SEQ.finditer(line):
+        chunks += 1
+        total += m.end() - m.start()
+        if total >= 12 and chunks >= 4:
+            return True
+    return False
 
 
 # ===== HTTP =====
-def _session() -> requests.Session:
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        ),
-        "Accept-Language": "ja,en;q=0.8",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Referer": f"{BASE}/search",
-        "Connection": "keep-alive",
-    })
-    return s
+# ウォームアップで得た cookie の保存先（プロセスをまたいで使い回す）
+_COOKIE_FILE = os.path.join(http_client.CACHE_DIR, "uta_cookies.json")
+_COOKIE_TTL_SEC = 6 * 3600
+
+
+def _session(use_cache: bool = True) -> requests.Session:
+    return http_client.new_session("utaten", use_cache=use_cache, headers=http_client.BROWSER_HEADERS)
 
 
 def warmup_session(s: requests.Session, sleep_sec: float = 0.25) -> None:
     try:
-        s.get(f"{BASE}/", timeout=20, allow_redirects=True)
+        s.get(f"{BASE}/", timeout=20, headers=_HEADERS, allow_redirects=True)
         time.sleep(sleep_sec)
-        s.get(f"{BASE}/search", timeout=20, allow_redirects=True)
+        s.get(f"{BASE}/search", timeout=20, headers=_HEADERS, allow_redirects=True)
         time.sleep(sleep_sec)
     except Exception:
         pass
 
 
-def fetch_html(s: requests.Session, url: str, timeout: int = 25) -> str:
-    r = s.get(url, timeout=timeout, allow_redirects=True)
+def _load_cookies(s: requests.Session) -> bool:
+    """
+    前回ウォームアップで得た cookie が新しければ（_COOKIE_TTL_SEC 以内）セッションに読み込む。
+    1 つでも読み込めたら True。
+    """
+    try:
+        if time.time() - os.path.getmtime(_COOKIE_FILE) > _COOKIE_TTL_SEC:
+            return False
+        with open(_COOKIE_FILE, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    loaded = False
+    now = time.time()
+    for c in saved:
+        if c.get("expires") and c["expires"] <= now:
+            continue
+        s.cookies.set(
+            c["name"], c["value"],
+            domain=c["domain"], path=c["path"], expires=c.get("expires"), secure=c.get("secure", False),
+        )
+        loaded = True
+    return loaded
+
+
+def _save_cookies(s: requests.Session) -> None:
+    """utaten.com の cookie だけを JSON で保存する（失敗しても無視）"""
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+         "expires": c.expires, "secure": c.secure}
+        for c in s.cookies
+        if c.domain.lstrip(".").endswith("utaten.com")
+    ]
+    if not cookies:
+        return
+    try:
+        os.makedirs(http_client.CACHE_DIR, exist_ok=True)
+        with open(_COOKIE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cookies, f)
+    except OSError:
+        pass
+
+
+def fetch_html(
+    s: requests.Session,
+    url: str,
+    timeout: int = 25,
+    min_interval: float = 0.0,
+) -> str:
+    """
+    HTML を取得して文字列で返す。
+    UtaTen は常に UTF-8 で配信されているので、文字コードは utf-8 固定で読む
+    （apparent_encoding による本文からの推測はしない。Content-Type に charset が無いと
+    requests は ISO-8859-1 扱いにするため、ヘッダの値にも頼らない）。
+    min_interval: utaten.com への前回アクセスからこの秒数は空ける（Retry-After があればそれも守る）。
+    """
+    http_client.RATE_LIMITER.wait(url, min_interval)
+    r = s.get(url, timeout=timeout, headers=_HEADERS, allow_redirects=True)
+    http_client.RATE_LIMITER.record(url, r)
     r.raise_for_status()
-    r.encoding = r.apparent_encoding or "utf-8"
+    r.encoding = _ENCODING
     return r.text
 
 
@@ -122,8 +207,17 @@ def build_search_url(title: str, artist: str) -> str:
 
 
 def parse_search_results(html: str) -> List[SearchHit]:
-    soup = BeautifulSoup(html, "html.parser")
-    links = soup.find_all("a", href=re.compile(r"^/lyric/[^/]+/"))
+    soup = BeautifulSoup(html, "lxml")
+    links = soup.find_all("a", href=_RE_LYRIC_HREF)
+
+    # artist リンクを含む祖先要素 → その中で最初の artist リンク
+    # （find_all は文書順なので先に入ったものが「最初」。登録済みの祖先より上は登録済み）
+    artist_in: Dict[int, Tag] = {}
+    for art in soup.find_all("a", href=_RE_ARTIST_HREF):
+        for anc in art.parents:
+            if id(anc) in artist_in:
+                break
+            artist_in[id(anc)] = art
 
     hits: List[SearchHit] = []
     seen = set()
@@ -139,15 +233,11 @@ def parse_search_results(html: str) -> List[SearchHit]:
         if not title:
             continue
 
-        row = a
-        for _ in range(12):
-            if row is None:
-                break
-            if getattr(row, "find", None) and row.find("a", href=re.compile(r"^/artist/\d+/")):
-                break
-            row = row.parent
-
-        artist_a = row.find("a", href=re.compile(r"^/artist/\d+/")) if getattr(row, "find", None) else None
+        # 曲リンク自身から 12 階層上までで、artist リンクを含む一番近い要素（＝その行）を探す
+        artist_a = next(
+            (artist_in[id(el)] for el in islice(chain((a,), a.parents), 13) if id(el) in artist_in),
+            None,
+        )
         artist = artist_a.get_text(strip=True) if artist_a else None
 
         hits.append(SearchHit(url=url, title=title, artist=artist))
@@ -181,7 +271,7 @@ def clean_line_drop_furigana_romaji(line: str) -> str:
       「昨日人 きのうひと を 殺 ころ したんだ」
       -> 「昨日人を殺したんだ」
     """
-    line = re.sub(r"\s+", " ", line).strip()
+    line = _RE_WS.sub(" ", line).strip()
     toks = line.split(" ")
 
     out: List[str] = []
@@ -207,33 +297,20 @@ def clean_line_drop_furigana_romaji(line: str) -> str:
     return "".join(out).strip()
 
 
-def extract_lyrics_only(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for t in soup(["script", "style", "noscript"]):
-        t.decompose()
-
-    # 歌詞の直前にある UI の「ダークモード」付近から拾う
-    start = soup.find(string=re.compile(r"ダークモード"))
-    if not start:
-        start = soup.find(string=re.compile(r"ふりがな"))
-    if not start:
-        return ""
-
-    stop_pat = re.compile(
-        r"(この歌詞へのご意見|みんなのレビュー|レビューを投稿|ブログやHPでこの歌詞を共有|UtaTenはreCAPTCHA|歌詞検索UtaTen)",
-        re.I
-    )
-
-    # DOM を走査して:
-    # - <br> だけ改行
-    # - 文字列同士は「スペース」を挟んで繋いで、ふりがな判定できるようにする
+def _collect_text(nodes: Iterable[PageElement], stop_pat: Optional[Pattern[str]] = None) -> str:
+    """
+    DOM を走査して:
+    - <br> だけ改行
+    - 文字列同士は「スペース」を挟んで繋いで、ふりがな判定できるようにする
+    stop_pat に当たる文字列が出たらそこで打ち切る。
+    """
     buf: List[str] = []
     last_was_nl = True
 
     def push_text(txt: str) -> None:
         nonlocal last_was_nl
         txt = txt.replace("\xa0", " ")
-        txt = re.sub(r"\s+", " ", txt).strip()
+        txt = _RE_WS.sub(" ", txt).strip()
         if not txt:
             return
         if not last_was_nl:
@@ -241,10 +318,10 @@ def extract_lyrics_only(html: str) -> str:
         buf.append(txt)
         last_was_nl = False
 
-    for node in start.next_elements:
+    for node in nodes:
         if isinstance(node, NavigableString):
             s = str(node)
-            if stop_pat.search(s):
+            if stop_pat is not None and stop_pat.search(s):
                 break
             push_text(s)
         elif isinstance(node, Tag):
@@ -252,20 +329,17 @@ def extract_lyrics_only(html: str) -> str:
                 buf.append("\n")
                 last_was_nl = True
 
-    raw = "".join(buf)
-    lines = [ln.strip() for ln in raw.split("\n")]
+    return "".join(buf)
 
-    junk_exact = {
-        "文字サイズ", "ふりがな", "ダークモード",
-        "歌詞検索", "マイページ",
-        "歌詞",
-    }
+
+def _clean_lyric_lines(raw: str) -> str:
+    lines = [ln.strip() for ln in raw.split("\n")]
 
     out_lines: List[str] = []
     for ln in lines:
         if not ln:
             continue
-        if ln in junk_exact:
+        if ln in _JUNK_EXACT:
             continue
 
         # ローマ字ブロックに入ったら終了
@@ -283,20 +357,56 @@ def extract_lyrics_only(html: str) -> str:
         out_lines.append(cl)
 
     text = "\n".join(out_lines).strip()
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_MULTI_NL.sub("\n\n", text)
     return text
 
 
+def extract_lyrics_only(html: str) -> str:
+    # 歌詞コンテナ（ふりがな付き表示の .hiragana など）があれば、そこだけをパースして中身だけ走査する
+    soup = BeautifulSoup(html, "lxml", parse_only=_LYRIC_STRAINER)
+    container = soup.select_one(f".{_LYRIC_CONTAINER_CLASS}") or soup.select_one(".lyricBox")
+    if container:
+        for t in container(["script", "style", "noscript"]):
+            t.decompose()
+        text = _clean_lyric_lines(_collect_text(container.descendants))
+        if text:
+            return text
+
+    # 見つからなければページ全体から、歌詞の直前にある UI の「ダークモード」付近から拾う
+    soup = BeautifulSoup(html, "lxml")
+    for t in soup(["script", "style", "noscript"]):
+        t.decompose()
+
+    start = soup.find(string=_RE_DARK_MODE)
+    if not start:
+        start = soup.find(string=_RE_FURIGANA)
+    if not start:
+        return ""
+
+    return _clean_lyric_lines(_collect_text(start.next_elements, stop_pat=_RE_STOP))
+
+
 # ===== 外部から呼び出す用 =====
 
-def fetch_utaten(title: str, artist: str, sleep_sec: float = 1.0) -> Tuple[str, Dict[str, Optional[str]]]:
+def fetch_utaten(
+    title: str,
+    artist: str,
+    sleep_sec: float = 1.0,
+    use_cache: bool = True,
+    session: Optional[requests.Session] = None,
+) -> Tuple[str, Dict[str, Optional[str]]]:
     """
     title / artist から UtaTen を検索して歌詞とメタ情報を返す。
     戻り値: (lyrics, meta)
     meta: { "url", "title", "artist", "search_url" }
+    session を渡した場合はそれを使う（複数サイトで共有する接続など）。
     """
-    s = _session()
-    warmup_session(s, sleep_sec=min(0.3, sleep_sec))
+    s = session if session is not None else _session(use_cache)
+    # 保存済みの cookie がまだ新しければ、ウォームアップの 2 リクエストを省く
+    if not (use_cache and _load_cookies(s)):
+        warmup_session(s, sleep_sec=min(0.3, sleep_sec))
+        if use_cache:
+            _save_cookies(s)
 
     search_url = build_search_url(title, artist)
     search_html = fetch_html(s, search_url)
@@ -306,9 +416,8 @@ def fetch_utaten(title: str, artist: str, sleep_sec: float = 1.0) -> Tuple[str,
     if not best:
         raise RuntimeError("検索結果が見つかりませんでした。title/artist を見直してください。")
 
-    time.sleep(sleep_sec)
-
-    lyric_html = fetch_html(s, best.url)
+    # 検索からの間隔は sleep_sec 空ける（検索がキャッシュから返った / 既に時間が経っていれば待たない）
+    lyric_html = fetch_html(s, best.url, min_interval=sleep_sec)
     lyrics = extract_lyrics_only(lyric_html)
 
     if not lyrics or len(lyrics) < 50:
@@ -340,9 +449,12 @@ def main() -> None:
     ap.add_argument("--title", required=True, help="曲名")
     ap.add_argument("--artist", required=True, help="アーティスト名")
     ap.add_argument("--sleep", type=float, default=1.0, help="アクセス間隔(秒)")
+    ap.add_argument("--no-cache", action="store_true", help="HTTP キャッシュを使わない")
     args = ap.parse_args()
 
-    lyrics, meta = fetch_utaten(args.title, args.artist, sleep_sec=args.sleep)
+    lyrics, meta = fetch_utaten(
+        args.title, args.artist, sleep_sec=args.sleep, use_cache=not args.no_cache
+    )
     print(lyrics)
 
 